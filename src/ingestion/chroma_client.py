@@ -1,9 +1,6 @@
 # built-in
 import os
-
-# chromadb
-import chromadb
-from chromadb.utils import embedding_functions
+from functools import lru_cache
 
 # python-dotenv
 from dotenv import load_dotenv
@@ -11,7 +8,16 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+@lru_cache(maxsize=None)
 def get_chroma_collection(collection_name: str = "confluence_collection"):
+    """
+    컬렉션을 한 번만 열고 재사용합니다.
+    chromadb는 import 비용이 크므로 처음 호출될 때 불러옵니다.
+    """
+    # chromadb
+    import chromadb
+    from chromadb.utils import embedding_functions
+
     client = chromadb.PersistentClient(path="./chromadb")
     openai_ef = embedding_functions.OpenAIEmbeddingFunction(
         api_key=os.getenv("OPENAI_API_KEY"),
@@ -1,7 +1,16 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from src.routes import slack
+from src.routes import health, slack
 
-app = FastAPI()
 
-app.include_router(slack.router, prefix="/slack", tags=["Slack"])
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await health.warm_up()
+    yield
+
 
+app = FastAPI(lifespan=lifespan)
+
+app.include_router(health.router, tags=["Health"])
+app.include_router(slack.router, prefix="/slack", tags=["Slack"])
@@ -4,28 +4,54 @@ import os
 # python-dotenv
 from dotenv import load_dotenv
 
-# openai
-from openai import AsyncOpenAI
-
 # ingestion
 from ingestion.chroma_client import get_chroma_collection
 
+# query
+from query import routing
+
 
 load_dotenv()
 
 CONFLUENCE_URL = os.getenv("CONFLUENCE_URL")
 SPACE_KEY = os.getenv("SPACE_KEY")
 
+WIKI_SYSTEM_PROMPT = (
+    "당신은 컨플루언스 위키 문서만을 기반으로 Slack 메시지 형식으로 답변하는 컨플루언스 위키봇입니다. "
+    "반드시 제공된 Context만을 사용하여 Slack Markdown을 활용해 깔끔하게 정리된 답변을 생성하세요.\n\n"
+    "- 매우 중요: 볼드체는 슬랙 Markdown 형식에 맞게 별표(*) 한 개만 사용합니다. 절대 별표 두 개(**)를 사용하지 마세요.\n"
+    "- 예시: *이것은 볼드체입니다* (O), **이것은 잘못된 형식입니다** (X)\n"
+    "- 문서 제목과 링크를 출처로 명확히 표기하세요. 예시: 출처: *<url|문서 제목>*\n"
+    "- 참고할 수 있는 문서는 최대한 참고하여 상세한 답변을 생성하세요. \n"
+    "- 중요한 코드 또는 강조할 문장은 슬랙 코드블록 스타일(```내용```) 또는 인라인 코드(`내용`)로 표현하세요.\n"
+    "- 답변 마지막에 출처를 명시하세요.\n"
+    "- Slack Markdown 포맷을 유지하세요."
+)
+
 
 def retrieve_relevant_chunks(query_text, top_k=3):
     collection = get_chroma_collection()
     results = collection.query(query_texts=[query_text], n_results=top_k)
     documents = results["documents"][0]
     metadatas = results["metadatas"][0]
-    return documents, metadatas
+    distances = results.get("distances", [[]])[0] or []
+    return documents, metadatas, distances
+
+
+def warm_up_collection() -> int:
+    """
+    컬렉션을 열고 한 번 검색해 HNSW 인덱스를 메모리에 올립니다.
+    임베딩 호출도 함께 일어나므로 OpenAI 연결도 미리 맺어집니다.
+    """
+    collection = get_chroma_collection()
+    count = collection.count()
+    if count:
+        collection.query(query_texts=["warm-up"], n_results=1)
+    return count
+
 
 async def query_confluence(prompt: str, temperature: float = 0.2):
-    documents, metadatas = retrieve_relevant_chunks(prompt)
+    documents, metadatas, distances = retrieve_relevant_chunks(prompt)
 
     # Slack Markdown 스타일 적용
     context_with_links = ""
@@ -42,33 +68,12 @@ async def query_confluence(prompt: str, temperature: float = 0.2):
         else:
             context_with_links += f"```{doc}```\n\n"
 
-    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    completion = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {
-            "role": "system",
-            "content": (
-                "당신은 컨플루언스 위키 문서만을 기반으로 Slack 메시지 형식으로 답변하는 컨플루언스 위키봇입니다. "
-                "반드시 제공된 Context만을 사용하여 Slack Markdown을 활용해 깔끔하게 정리된 답변을 생성하세요.\n\n"
-                "- 매우 중요: 볼드체는 슬랙 Markdown 형식에 맞게 별표(*) 한 개만 사용합니다. 절대 별표 두 개(**)를 사용하지 마세요.\n"
-                "- 예시: *이것은 볼드체입니다* (O), **이것은 잘못된 형식입니다** (X)\n"
-                "- 문서 제목과 링크를 출처로 명확히 표기하세요. 예시: 출처: *<url|문서 제목>*\n"
-                "- 참고할 수 있는 문서는 최대한 참고하여 상세한 답변을 생성하세요. \n"
-                "- 중요한 코드 또는 강조할 문장은 슬랙 코드블록 스타일(```내용```) 또는 인라인 코드(`내용`)로 표현하세요.\n"
-                "- 답변 마지막에 출처를 명시하세요.\n"
-                "- Slack Markdown 포맷을 유지하세요."
-            ),
-        },
-            {
-                "role": "user",
-                "content": f"Context:\n{context_with_links}\n\nQuestion: {prompt}",
-            },
-        ],
+    return await routing.create_completion(
+        request_type=routing.REQUEST_TYPE_WIKI,
+        system_prompt=WIKI_SYSTEM_PROMPT,
+        user_content=f"Context:\n{context_with_links}\n\nQuestion: {prompt}",
         temperature=temperature,
+        retrieval_distance=min(distances) if distances else None,
     )
 
-    return completion.choices[0].message.content.strip()
-
 
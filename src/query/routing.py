@@ -0,0 +1,227 @@
+# built-in
+import os
+import time
+from collections import deque
+from functools import lru_cache
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Tuple
+
+# python-dotenv
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    # openai
+    from openai import AsyncOpenAI
+
+
+load_dotenv()
+
+PRIMARY_MODEL = os.getenv("OPENAI_PRIMARY_MODEL", "gpt-4o")
+FAST_MODEL = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
+
+# 라우팅 기준
+# 요약할 스레드의 추정 토큰 예산입니다. 모델 컨텍스트(128k)보다 충분히 작게 잡습니다.
+# 위키 답변의 Context는 자르지 않습니다. 검색 결과 3개를 모두 보내야 답변 품질이 유지되고,
+# 위키 라우팅은 프롬프트 크기와 무관하므로 잘라도 얻는 것이 없습니다.
+SUMMARY_MAX_PROMPT_TOKENS = int(os.getenv("ROUTING_SUMMARY_MAX_PROMPT_TOKENS", "30000"))
+# 요약은 이 크기 이하의 스레드만 빠른 모델로 보냅니다.
+SUMMARY_FAST_MAX_PROMPT_TOKENS = int(os.getenv("ROUTING_SUMMARY_FAST_MAX_PROMPT_TOKENS", "4000"))
+# Chroma 컬렉션은 기본값인 제곱 L2 거리를 쓰고, OpenAI 임베딩은 길이가 1로 정규화되어 있으므로
+# 거리 = 2 - 2 * 코사인 유사도입니다. 설정은 이해하기 쉬운 코사인 유사도로 받고 거리로 변환합니다.
+# 유사도 분포는 OPENAI_EMBEDDING_MODEL에 따라 크게 다릅니다. text-embedding-ada-002는 대부분의
+# 질의가 0.7을 넘고, text-embedding-3-* 모델은 관련 문서도 보통 0.3~0.6 사이입니다.
+# 요청마다 출력되는 라우팅 로그의 similarity 값을 보고 배포 환경에 맞게 조정하세요.
+CONFIDENT_SIMILARITY = float(os.getenv("ROUTING_CONFIDENT_SIMILARITY", "0.7"))
+CONFIDENT_DISTANCE = 2 - 2 * CONFIDENT_SIMILARITY
+
+# 폴백 기준
+# 큰 프롬프트와 긴 답변이 기본 모델에 몰리므로, 전체 지연 시간 대신 출력 토큰당 지연 시간을 봅니다.
+# 0.05초는 초당 20토큰으로, 정상 상태의 gpt-4o보다 몇 배 느린 수준입니다.
+FALLBACK_SECONDS_PER_TOKEN = float(os.getenv("MODEL_FALLBACK_SECONDS_PER_TOKEN", "0.05"))
+# 출력이 짧으면 고정 오버헤드가 토큰당 지연 시간을 부풀리므로 지연 시간 통계에서 제외합니다.
+LATENCY_MIN_OUTPUT_TOKENS = int(os.getenv("MODEL_LATENCY_MIN_OUTPUT_TOKENS", "50"))
+FALLBACK_ERROR_RATE = float(os.getenv("MODEL_FALLBACK_ERROR_RATE", "0.3"))
+HEALTH_WINDOW = int(os.getenv("MODEL_HEALTH_WINDOW", "20"))
+HEALTH_MIN_SAMPLES = int(os.getenv("MODEL_HEALTH_MIN_SAMPLES", "5"))
+HEALTH_TTL_SECONDS = float(os.getenv("MODEL_HEALTH_TTL_SECONDS", "300"))
+
+REQUEST_TYPE_WIKI = "wiki"
+REQUEST_TYPE_SUMMARY = "summary"
+
+
+class ModelHealth:
+    """
+    모델별 최근 호출의 출력 토큰당 지연 시간과 오류 여부를 기록합니다.
+    TTL이 지난 기록은 무시하므로, 폴백 이후에도 시간이 지나면 기본 모델로 복귀합니다.
+    """
+
+    def __init__(self, window: int = HEALTH_WINDOW):
+        self.samples: Deque[Tuple[float, Optional[float], bool]] = deque(maxlen=window)
+
+    def record(self, seconds_per_token: Optional[float], ok: bool) -> None:
+        self.samples.append((time.monotonic(), seconds_per_token, ok))
+
+    def _recent(self) -> List[Tuple[float, Optional[float], bool]]:
+        now = time.monotonic()
+        return [sample for sample in self.samples if now - sample[0] <= HEALTH_TTL_SECONDS]
+
+    def is_degraded(self) -> bool:
+        recent = self._recent()
+        if len(recent) < HEALTH_MIN_SAMPLES:
+            return False
+
+        error_rate = sum(1 for _, _, ok in recent if not ok) / len(recent)
+        if error_rate > FALLBACK_ERROR_RATE:
+            return True
+
+        latencies = [latency for _, latency, ok in recent if ok and latency is not None]
+        if len(latencies) >= HEALTH_MIN_SAMPLES and sum(latencies) / len(latencies) > FALLBACK_SECONDS_PER_TOKEN:
+            return True
+
+        return False
+
+
+_health: Dict[str, ModelHealth] = {}
+
+
+def get_model_health(model: str) -> ModelHealth:
+    if model not in _health:
+        _health[model] = ModelHealth()
+    return _health[model]
+
+
+@lru_cache(maxsize=1)
+def get_openai_client() -> "AsyncOpenAI":
+    """
+    요청마다 클라이언트를 새로 만들지 않고, 커넥션 풀을 재사용하기 위해 공유 클라이언트를 반환합니다.
+    openai 패키지는 처음 호출될 때 불러옵니다.
+    """
+    # openai
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 대략적인 토큰 수를 추정합니다.
+    한글은 글자당 토큰 수가 영어보다 많으므로 보수적으로 2글자당 1토큰으로 계산합니다.
+    """
+    return (len(text) + 1) // 2
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    return text[: max(max_tokens * 2 - 1, 0)] + "…\n\n"
+
+
+def fit_thread_to_token_budget(parts: List[str], max_tokens: int = SUMMARY_MAX_PROMPT_TOKENS) -> List[str]:
+    """
+    스레드 메시지를 메시지 단위로 예산 안에 맞춥니다.
+    스레드 주제를 담은 첫 메시지는 항상 남기고, 나머지 예산은 최신 메시지부터 채웁니다.
+    메시지 하나가 남은 예산보다 크면 버리지 않고 앞부분만 잘라 남깁니다.
+
+    Args:
+        parts: 시간순으로 나열된 포맷된 메시지
+        max_tokens: 추정 토큰 예산
+
+    Returns:
+        시간순을 유지한, 예산 안에 들어가는 메시지 목록
+    """
+    if not parts:
+        return []
+
+    # 첫 메시지가 너무 길어도 최신 메시지가 들어갈 자리를 남깁니다.
+    root = _truncate_to_tokens(parts[0], max_tokens // 2)
+    used = estimate_tokens(root)
+    latest = []
+
+    for part in reversed(parts[1:]):
+        tokens = estimate_tokens(part)
+        if used + tokens > max_tokens:
+            if not latest and max_tokens - used > 0:
+                latest.append(_truncate_to_tokens(part, max_tokens - used))
+            break
+        latest.append(part)
+        used += tokens
+
+    return [root] + list(reversed(latest))
+
+
+def select_model(request_type: str, prompt_tokens: int, retrieval_distance: Optional[float] = None) -> str:
+    """
+    요청 유형, 프롬프트 크기, 검색 신뢰도와 기본 모델의 상태를 보고 사용할 모델을 고릅니다.
+    위키 답변은 검색 신뢰도로, 스레드 요약은 프롬프트 크기로 결정합니다.
+
+    Args:
+        request_type: REQUEST_TYPE_WIKI 또는 REQUEST_TYPE_SUMMARY
+        prompt_tokens: 시스템 프롬프트를 포함한 추정 토큰 수
+        retrieval_distance: 가장 가까운 검색 결과의 거리 (작을수록 신뢰도가 높음)
+
+    Returns:
+        사용할 모델 이름
+    """
+    if get_model_health(PRIMARY_MODEL).is_degraded():
+        return FAST_MODEL
+
+    if request_type == REQUEST_TYPE_SUMMARY:
+        return FAST_MODEL if prompt_tokens <= SUMMARY_FAST_MAX_PROMPT_TOKENS else PRIMARY_MODEL
+
+    if retrieval_distance is not None and retrieval_distance <= CONFIDENT_DISTANCE:
+        return FAST_MODEL
+
+    return PRIMARY_MODEL
+
+
+async def _create(model: str, messages: List[Dict[str, str]], temperature: float) -> str:
+    client = get_openai_client()
+    health = get_model_health(model)
+    started = time.monotonic()
+
+    try:
+        completion = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+        )
+    except Exception:
+        health.record(None, ok=False)
+        raise
+
+    elapsed = time.monotonic() - started
+    output_tokens = completion.usage.completion_tokens if completion.usage else 0
+    seconds_per_token = elapsed / output_tokens if output_tokens >= LATENCY_MIN_OUTPUT_TOKENS else None
+    health.record(seconds_per_token, ok=True)
+    return completion.choices[0].message.content.strip()
+
+
+async def create_completion(
+    request_type: str,
+    system_prompt: str,
+    user_content: str,
+    temperature: float,
+    retrieval_distance: Optional[float] = None,
+) -> str:
+    """
+    모델을 골라 답변을 생성합니다.
+    고정된 시스템 프롬프트를 앞에, 요청마다 바뀌는 내용을 뒤에 둡니다.
+    기본 모델 호출이 실패하면 빠른 모델로 한 번 재시도합니다.
+    """
+    prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_content)
+    model = select_model(request_type, prompt_tokens, retrieval_distance)
+
+    similarity = f"{1 - retrieval_distance / 2:.3f}" if retrieval_distance is not None else "-"
+    print(f"🧭 ROUTE: {request_type} → {model} (tokens≈{prompt_tokens}, similarity={similarity})")
+
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_content},
+    ]
+
+    try:
+        return await _create(model, messages, temperature)
+    except Exception as e:
+        if model == FAST_MODEL:
+            raise
+        print(f"⚠️ {model} 호출 실패, {FAST_MODEL}로 재시도합니다: {e}")
+        return await _create(FAST_MODEL, messages, temperature)
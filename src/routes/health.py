@@ -0,0 +1,97 @@
+# built-in
+import asyncio
+import os
+import time
+from typing import Any, Dict, Optional
+
+# fastapi
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+# query
+from query import routing
+from query.query import warm_up_collection
+
+# utils
+from utils import slacks
+
+router = APIRouter()
+
+# 의존성 하나가 멈춰도 서버 시작이 막히지 않도록 단계별 시간 제한을 둡니다.
+WARMUP_STEP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_STEP_TIMEOUT_SECONDS", "10"))
+
+warmup_state: Dict[str, Any] = {"ready": False, "steps": {}}
+_warmup_lock = asyncio.Lock()
+# 시간 제한을 넘긴 Chroma 작업 스레드는 취소할 수 없으므로, 실행 중인 작업이 있으면 새로 만들지 않고 기다립니다.
+_chroma_future: Optional[asyncio.Future] = None
+_retry_task: Optional[asyncio.Task] = None
+
+
+async def _warm_up_chroma() -> None:
+    global _chroma_future
+    # 시간 제한 이후에 성공한 작업은 결과를 그대로 쓰고, 실패한 경우에만 새로 시작합니다.
+    if _chroma_future is None or (_chroma_future.done() and _chroma_future.exception() is not None):
+        _chroma_future = asyncio.ensure_future(asyncio.to_thread(warm_up_collection))
+
+    # wait_for가 시간 제한으로 취소해도 진행 중인 작업은 그대로 두고 다음 재시도에서 이어서 기다립니다.
+    count = await asyncio.shield(_chroma_future)
+    print(f"🔥 WARM-UP: Chroma 컬렉션 로드 완료 ({count}개 청크)")
+
+
+async def _warm_up_openai() -> None:
+    client = routing.get_openai_client().with_options(timeout=WARMUP_STEP_TIMEOUT_SECONDS, max_retries=0)
+    await client.models.list()
+
+
+async def _warm_up_slack() -> None:
+    if not await asyncio.to_thread(slacks.warm_up, WARMUP_STEP_TIMEOUT_SECONDS):
+        raise RuntimeError("Slack auth.test 호출 실패")
+
+
+WARMUP_STEPS = {
+    "chroma": _warm_up_chroma,
+    "openai": _warm_up_openai,
+    "slack": _warm_up_slack,
+}
+
+
+async def _run_step(name: str) -> Dict[str, Any]:
+    started = time.monotonic()
+    try:
+        await asyncio.wait_for(WARMUP_STEPS[name](), timeout=WARMUP_STEP_TIMEOUT_SECONDS)
+        return {"ok": True, "seconds": round(time.monotonic() - started, 3)}
+    except asyncio.TimeoutError:
+        print(f"❌ WARM-UP: {name} 준비가 {WARMUP_STEP_TIMEOUT_SECONDS}초 안에 끝나지 않았습니다.")
+        return {"ok": False, "seconds": round(time.monotonic() - started, 3), "error": "timeout"}
+    except Exception as e:
+        print(f"❌ WARM-UP: {name} 준비 중 오류 발생: {e}")
+        return {"ok": False, "seconds": round(time.monotonic() - started, 3), "error": str(e)}
+
+
+async def warm_up() -> None:
+    """
+    트래픽을 받기 전에 컬렉션과 인덱스를 메모리에 올리고 외부 API 연결을 미리 맺습니다.
+    이미 성공한 단계는 건너뛰므로, 다시 호출하면 실패한 단계만 재시도합니다.
+    모든 단계가 성공해야 준비 완료로 표시합니다.
+    """
+    async with _warmup_lock:
+        steps = warmup_state["steps"]
+        pending = [name for name in WARMUP_STEPS if not steps.get(name, {}).get("ok")]
+        results = await asyncio.gather(*(_run_step(name) for name in pending))
+        steps.update(zip(pending, results))
+        warmup_state["ready"] = all(steps[name]["ok"] for name in WARMUP_STEPS)
+
+
+@router.get("/ready")
+async def readiness() -> JSONResponse:
+    # 시작 시 일시적인 장애로 실패했더라도 영구히 503에 머물지 않도록, 준비되지 않았으면 백그라운드에서 다시 시도합니다.
+    # 프로브가 짧은 시간 제한으로 호출해도 되도록 재시도를 기다리지 않고 현재 상태를 바로 반환합니다.
+    global _retry_task
+    if not warmup_state["ready"] and (_retry_task is None or _retry_task.done()):
+        _retry_task = asyncio.create_task(warm_up())
+
+    status_code = 200 if warmup_state["ready"] else 503
+    return JSONResponse(
+        content={"status": "ready" if warmup_state["ready"] else "not_ready", "steps": warmup_state["steps"]},
+        status_code=status_code,
+    )
@@ -9,11 +9,8 @@ from fastapi import APIRouter, Request, BackgroundTasks
 # python-dotenv
 from dotenv import load_dotenv
 
-# openai
-import openai
-from openai import AsyncOpenAI
-
 # query
+from query import routing
 from query.query import query_confluence
 
 # utils
@@ -21,7 +18,6 @@ from utils import slacks
 
 # 환경변수 로드
 load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
 SPACE_KEY = os.getenv("SPACE_KEY")
 
 router = APIRouter()
@@ -31,6 +27,19 @@ VALID_CHANNEL_TYPES = {"im", "channel"}
 WIKI_COMMAND_PREFIX = "위키/"
 SUMMARY_COMMAND_PREFIX = "요약/"
 
+SUMMARY_SYSTEM_PROMPT = (
+    "당신은 슬랙 스레드 내용을 요약하는 도우미입니다. "
+    "주어진 슬랙 스레드의 대화 내용을 간결하게 핵심 포인트만 요약해주세요. "
+    "대화 내용, 정보 공유, 질문과 답변 등 다양한 형태의 메시지를 포함할 수 있습니다. "
+    "요약은 불릿 포인트 형식으로 작성하고, 각 포인트는 간결하고 명확하게 작성해주세요.\n\n"
+    "• 핵심 포인트 1\n"
+    "• 핵심 포인트 2\n"
+    "• 핵심 포인트 3\n\n"
+    "매우 중요: 슬랙에서 볼드체는 별표(*) 한 개만 사용합니다. 절대 별표 두 개(**)를 사용하지 마세요.\n"
+    "예시: *이것은 볼드체입니다* (O), **이것은 잘못된 형식입니다** (X)\n"
+    "`코드`, ```코드 블록```등을 적절히 사용해 요약을 보기 좋게 작성하세요."
+)
+
 
 @router.post("/events")
 async def slack_event_handler(request: Request, background_tasks: BackgroundTasks) -> JSONResponse:
@@ -109,40 +118,19 @@ async def handle_summary_command(channel: str, thread_ts: str) -> None:
         )
         return
 
-    # Format the messages for the model
-    formatted_messages = slacks.format_thread_messages(messages)
+    # Format the messages for the model, keeping the root and the most recent ones that fit the budget
+    formatted = [slacks.format_thread_message(message) for message in messages]
+    formatted = [text for text in formatted if text]
+    formatted_messages = "".join(routing.fit_thread_to_token_budget(formatted))
 
     # Generate summary with OpenAI
-    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-
-    completion = await client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {
-                "role": "system",
-                "content": (
-                    "당신은 슬랙 스레드 내용을 요약하는 도우미입니다. "
-                    "주어진 슬랙 스레드의 대화 내용을 간결하게 핵심 포인트만 요약해주세요. "
-                    "대화 내용, 정보 공유, 질문과 답변 등 다양한 형태의 메시지를 포함할 수 있습니다. "
-                    "요약은 불릿 포인트 형식으로 작성하고, 각 포인트는 간결하고 명확하게 작성해주세요.\n\n"
-                    "• 핵심 포인트 1\n"
-                    "• 핵심 포인트 2\n"
-                    "• 핵심 포인트 3\n\n"
-                    "매우 중요: 슬랙에서 볼드체는 별표(*) 한 개만 사용합니다. 절대 별표 두 개(**)를 사용하지 마세요.\n"
-                    "예시: *이것은 볼드체입니다* (O), **이것은 잘못된 형식입니다** (X)\n"
-                    "`코드`, ```코드 블록```등을 적절히 사용해 요약을 보기 좋게 작성하세요."
-                )
-            },
-            {
-                "role": "user",
-                "content": f"다음 슬랙 스레드 내용을 요약해주세요:\n\n{formatted_messages}"
-            }
-        ],
+    summary = await routing.create_completion(
+        request_type=routing.REQUEST_TYPE_SUMMARY,
+        system_prompt=SUMMARY_SYSTEM_PROMPT,
+        user_content=f"다음 슬랙 스레드 내용을 요약해주세요:\n\n{formatted_messages}",
         temperature=0.3,
     )
 
-    summary = completion.choices[0].message.content.strip()
-
     # Post the summary back to the thread
     slack_bot = slacks.SlackBot(
         channel=channel,
@@ -15,6 +15,12 @@ SLACK_HEADERS = {
     "Authorization": f"Bearer {SLACK_TOKEN}",
 }
 
+SLACK_TIMEOUT_SECONDS = float(os.getenv("SLACK_TIMEOUT_SECONDS", "10"))
+
+# 요청마다 TLS 연결을 새로 맺지 않도록 세션을 재사용합니다.
+SLACK_SESSION = requests.Session()
+SLACK_SESSION.headers.update(SLACK_HEADERS)
+
 
 class SlackBot(BaseModel):
     channel: str
@@ -38,7 +44,7 @@ def post_message(slack_bot: SlackBot, message: str, ts: Optional[str] = None, is
 
 
     try:
-        response = requests.post("https://slack.com/api/chat.postMessage", headers=SLACK_HEADERS, json=payload)
+        response = SLACK_SESSION.post("https://slack.com/api/chat.postMessage", json=payload, timeout=SLACK_TIMEOUT_SECONDS)
         return response.json().get("ts")
     except Exception as e:
         print(e)
@@ -50,14 +56,14 @@ def get_thread_messages(channel: str, thread_ts: str) -> List[Dict[str, Any]]:
     Fetch all messages in a thread
     """
     try:
-        response = requests.get(
+        response = SLACK_SESSION.get(
             "https://slack.com/api/conversations.replies",
-            headers=SLACK_HEADERS,
             params={
                 "channel": channel,
                 "ts": thread_ts,
                 "limit": 100  # Maximum messages to retrieve
-            }
+            },
+            timeout=SLACK_TIMEOUT_SECONDS,
         )
 
         result = response.json()
@@ -71,21 +77,30 @@ def get_thread_messages(channel: str, thread_ts: str) -> List[Dict[str, Any]]:
         return []
 
 
-def format_thread_messages(messages: List[Dict[str, Any]]) -> str:
+def format_thread_message(message: Dict[str, Any]) -> str:
     """
-    Format thread messages for summarization
+    Format a single thread message, returning an empty string for messages with no text
     """
-    formatted_text = ""
+    user = message.get("user", "Unknown")
+    text = message.get("text", "")
 
-    for message in messages:
-        user = message.get("user", "Unknown")
-        text = message.get("text", "")
+    if not text.strip():
+        return ""
 
-        # Skip messages with no text
-        if not text.strip():
-            continue
+    return f"User {user}: {text}\n\n"
 
-        formatted_text += f"User {user}: {text}\n\n"
-
-    return formatted_text
 
+def warm_up(timeout: float = SLACK_TIMEOUT_SECONDS) -> bool:
+    """
+    auth.test를 호출해 토큰을 확인하고 세션의 연결을 미리 맺어둡니다.
+    """
+    try:
+        response = SLACK_SESSION.post("https://slack.com/api/auth.test", timeout=timeout)
+        result = response.json()
+        if not result.get("ok", False):
+            print(f"Error warming up Slack session: {result.get('error')}")
+            return False
+        return True
+    except Exception as e:
+        print(f"Exception warming up Slack session: {e}")
+        return False